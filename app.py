@@ -30,22 +30,62 @@
 # 4) Create headers in the two tabs (or the app will auto-create them):
 #    sessions: id, session_date, capacity, cutoff_utc, title, notes
 #    signups: id, session_id, name, role, added_by, created_utc, status
+#    (the sessions columns must be in exactly this order, A:F, since the app
+#    reads them by position; cell G1 on `sessions` is reserved: the app stores
+#    a write-revision token there. Signups columns may be in any order.)
 #
-# 5) requirements.txt should include: streamlit, gspread, google-auth
+# 5) requirements.txt should include: streamlit, gspread, google-auth, requests, pandas
 
 import datetime as dt
+import functools
+import random
+import time
+from bisect import insort
+from operator import itemgetter
 import uuid
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
+import pandas as pd
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------- Config ----------------------
 ADMIN_PIN = st.secrets.get("app", {}).get("admin_pin", "1234")
 SHEET_ID = st.secrets.get("app", {}).get("sheet_id", "")
+SESSION_HEADERS = ["id","session_date","capacity","cutoff_utc","title","notes"]
+SIGNUP_HEADERS = ["id","session_id","name","role","added_by","created_utc","status"]
+
+# (spreadsheet, sessions worksheet, signups worksheet) as returned by get_sheet()
+SheetHandles = Tuple[gspread.Spreadsheet, gspread.Worksheet, gspread.Worksheet]
 
 # ---------------------- Google Sheets Helpers ----------------------
+RETRY_STATUS_CODES = (429, 500, 503)
+# A 5xx on a non-idempotent request (append) may come after it was applied,
+# so those are only retried when the quota rejected them outright
+QUOTA_STATUS_CODES = (429,)
+RETRY_ATTEMPTS = 5
+
+def _retry(fn, status_codes: Tuple[int, ...] = RETRY_STATUS_CODES):
+    # Retry a gspread call that hit the per-minute quota (429) or a transient
+    # server error, with exponential backoff plus jitter; anything else, or
+    # the last failed attempt, is raised as usual. Only wrap single API calls,
+    # never a function that itself makes retried calls, so retries don't stack.
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return fn(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                if e.response.status_code not in status_codes or attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                time.sleep(2 ** attempt + random.random())
+    return wrapper
+
 @st.cache_resource(show_spinner=False)
 def get_client():
     creds_info = st.secrets["gcp_service_account"]
@@ -54,27 +94,51 @@ def get_client():
         "https://www.googleapis.com/auth/drive.readonly",
     ]
     creds = Credentials.from_service_account_info(creds_info, scopes=scopes)
-    return gspread.authorize(creds)
+    # One pooled keep-alive session per container, so requests reuse the TLS
+    # connection. The transport only retries connection failures; HTTP status
+    # retries (429/5xx) are left to _retry, which sees them as APIError
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    return gspread.Client(auth=creds, session=session)
 
 @st.cache_resource(show_spinner=False)
 def get_sheet():
     gc = get_client()
-    sh = gc.open_by_key(SHEET_ID)
-    # Ensure worksheets exist
-    try:
-        ws_sessions = sh.worksheet("sessions")
-    except gspread.WorksheetNotFound:
-        ws_sessions = sh.add_worksheet("sessions", rows=1000, cols=10)
-    try:
-        ws_signups = sh.worksheet("signups")
-    except gspread.WorksheetNotFound:
-        ws_signups = sh.add_worksheet("signups", rows=5000, cols=12)
-
-    # Ensure headers
-    if not ws_sessions.get_all_values():
-        ws_sessions.append_row(["id","session_date","capacity","cutoff_utc","title","notes"]) 
-    if not ws_signups.get_all_values():
-        ws_signups.append_row(["id","session_id","name","role","added_by","created_utc","status"]) 
+    sh = _retry(gc.open_by_key)(SHEET_ID)
+    # Ensure worksheets exist (one metadata request covers both lookups)
+    existing = {ws.title: ws for ws in _retry(sh.worksheets)()}
+    add_worksheet = _retry(sh.add_worksheet, QUOTA_STATUS_CODES)
+    ws_sessions = existing.get("sessions") or add_worksheet("sessions", rows=1000, cols=10)
+    ws_signups = existing.get("signups") or add_worksheet("signups", rows=5000, cols=12)
+
+    # Ensure headers: one light read of both header rows (get_sheet is a cached
+    # resource, so this runs once per container), then seed any missing ones
+    # in one request
+    first_rows = _retry(sh.values_batch_get)([f"{ws_sessions.title}!1:1", f"{ws_signups.title}!1:1"])["valueRanges"]
+    session_headers = first_rows[0].get("values", [[]])[0][:len(SESSION_HEADERS)]
+    if session_headers and session_headers != SESSION_HEADERS:
+        raise RuntimeError(
+            f"The `{ws_sessions.title}` tab must start with the headers "
+            f"{', '.join(SESSION_HEADERS)} (columns A:F, in that order)."
+        )
+    headers = [
+        (ws, cols)
+        for ws, cols, rng in zip((ws_sessions, ws_signups), (SESSION_HEADERS, SIGNUP_HEADERS), first_rows)
+        if not rng.get("values")
+    ]
+    if headers:
+        _retry(sh.values_batch_update)({
+            "valueInputOption": "RAW",
+            "data": [
+                {"range": f"{ws.title}!A1:{rowcol_to_a1(1, len(cols))}", "values": [cols]}
+                for ws, cols in headers
+            ],
+        })
     return sh, ws_sessions, ws_signups
 
 # Utility
@@ -83,25 +147,241 @@ def utc_now_str() -> str:
     return dt.datetime.utcnow().replace(microsecond=0).isoformat()
 
 # Data access
+# Sheet reads are cached for a short TTL so one rerun (and neighbouring reruns)
+# share a single snapshot instead of re-downloading each tab per helper call.
+# Every write path must call invalidate_cache() afterwards.
+
+READ_TTL_SECONDS = 30
+# Optimistic concurrency, best effort: every signup write stores a fresh token
+# here (on the sessions tab, right of the headers). A writer that planned its
+# changes from an older snapshot usually sees a different token and re-plans.
+# The check and the write are separate requests, so two writers can still both
+# pass it; _guarded_write re-reads the token after committing to catch that.
+REVISION_CELL = "G1"
+WRITE_RETRIES = 3
+
+def _pad_rows(data: List[List[str]]) -> List[List[str]]:
+    # Fit every row to header width: the values API drops trailing empty
+    # cells, and stray values right of the headers are ignored
+    if not data:
+        return []
+    width = len(data[0])
+    return [list(row[:width]) + [""] * (width - len(row)) for row in data]
+
+
+def _read_snapshot(sheet: Optional[SheetHandles] = None) -> Tuple[List[List[str]], List[List[str]], str]:
+    # Session picker columns (A:E, everything but notes), the whole signups
+    # tab and the revision token in a single batchGet request
+    sh, ws_sessions, ws_signups = sheet or get_sheet()
+    ranges = _retry(sh.values_batch_get)([
+        f"{ws_sessions.title}!A:E",
+        ws_signups.title,
+        f"{ws_sessions.title}!{REVISION_CELL}",
+    ])["valueRanges"]
+    revision = ranges[2].get("values", [[""]])[0][0]
+    return _pad_rows(ranges[0].get("values", [])), _pad_rows(ranges[1].get("values", [])), revision
+
+
+@st.cache_data(ttl=READ_TTL_SECONDS, show_spinner=False)
+def _fetch_all() -> Tuple[List[List[str]], List[List[str]], str]:
+    return _read_snapshot()
+
+
+def _parse_session_list(data: List[List[str]]) -> List[Tuple[str,str,int,str,str,int]]:
+    # Picker rows as (id, session_date, capacity, cutoff_utc, title, sheet_row),
+    # sorted newest first
+    if not data:
+        return []
+    idx_map = {h:i for i,h in enumerate(data[0])}
+    out = []
+    for r_i, row in enumerate(data[1:], start=2):
+        if not row[idx_map["id"]]:
+            continue
+        out.append((
+            row[idx_map["id"]],
+            row[idx_map["session_date"]],
+            int(row[idx_map["capacity"]] or 0),
+            row[idx_map["cutoff_utc"]],
+            row[idx_map["title"]],
+            r_i,
+        ))
+    out.sort(key=lambda t: t[1], reverse=True)
+    return out
 
-def read_sessions() -> List[dict]:
+
+@st.cache_data(ttl=READ_TTL_SECONDS, show_spinner=False)
+def _load_session_list() -> List[Tuple[str,str,int,str,str,int]]:
+    # Parsed and sorted once per snapshot rather than on every rerun
+    return _parse_session_list(_fetch_all()[0])
+
+
+@st.cache_data(ttl=READ_TTL_SECONDS, show_spinner=False)
+def _load_session_notes(row: int) -> str:
+    # notes (column F) is the only session field not in the snapshot, and is
+    # only read for the session being shown
     _, ws_sessions, _ = get_sheet()
-    rows = ws_sessions.get_all_records()
-    # Normalize types
-    for r in rows:
-        r["capacity"] = int(r.get("capacity", 0) or 0)
-    # Sort newest first by date
-    try:
-        rows.sort(key=lambda r: r.get("session_date",""), reverse=True)
-    except Exception:
-        pass
-    return rows
+    return _retry(ws_sessions.acell)(rowcol_to_a1(row, len(SESSION_HEADERS))).value or ""
+
+
+def _parse_signups(data: List[List[str]]) -> pd.DataFrame:
+    # Signups as a DataFrame so per-session filtering is a vectorized mask.
+    # Adds the priority bucket (0 = core, 1 = outsider) and the sheet row, so
+    # writers can address a status cell without a lookup, and is sorted into
+    # priority order once (filters keep that order).
+    if not data:
+        return pd.DataFrame(columns=SIGNUP_HEADERS + ["_pri", "_row"])
+    df = pd.DataFrame(data[1:], columns=data[0])
+    df["_pri"] = (df["role"] != "core").astype(int)
+    df["_row"] = df.index + 2
+    return df.sort_values(["_pri", "created_utc"], kind="stable")
+
 
+@st.cache_data(ttl=READ_TTL_SECONDS, show_spinner=False)
+def _load_signups_df() -> pd.DataFrame:
+    return _parse_signups(_fetch_all()[1])
 
-def write_session(session_date: dt.date, capacity: int, cutoff_utc: dt.datetime, title: str, notes: str) -> str:
-    sh, ws_sessions, _ = get_sheet()
+
+def _active_signups(df: pd.DataFrame, session_id: str) -> List[dict]:
+    # Active signups for the session, already in priority order
+    if df.empty:
+        return []
+    active = df[(df["session_id"] == session_id) & (df["status"] != "removed")]
+    return active.to_dict("records")
+
+
+def _find_session(sessions: List[Tuple[str,str,int,str,str,int]], session_id: str) -> Optional[dict]:
+    for s in sessions:
+        if s[0] == session_id:
+            # Picker fields plus the sheet row; notes are read separately via
+            # _load_session_notes(session["_row"]) where they are shown
+            session = dict(zip(SESSION_HEADERS, s[:5]))
+            session["_row"] = s[5]
+            return session
+    return None
+
+
+class Snapshot:
+    # One read of the sheet as handed to write plans: sessions, signups and
+    # the revision token all come from the same batchGet. Parsed here rather
+    # than through the cached loaders, which a concurrent rerun may refill
+    # from an older read.
+
+    def __init__(self, data: Tuple[List[List[str]], List[List[str]], str]):
+        sessions, signups, self.revision = data
+        self.sessions = _parse_session_list(sessions)
+        self.signup_headers = signups[0] if signups else SIGNUP_HEADERS
+        self.status_col = self.signup_headers.index("status") + 1
+        self.df = _parse_signups(signups)
+
+    def session(self, session_id: str) -> Optional[dict]:
+        return _find_session(self.sessions, session_id)
+
+    def signups(self, session_id: str) -> List[dict]:
+        return _active_signups(self.df, session_id)
+
+
+def _current_revision(sheet: Optional[SheetHandles] = None) -> str:
+    # Uncached: what the sheet holds right now, not the snapshot's token
+    _, ws_sessions, _ = sheet or get_sheet()
+    return _retry(ws_sessions.acell)(REVISION_CELL).value or ""
+
+
+class SheetTxn:
+    # Write buffer for one user action. Cell/range updates and row appends are
+    # queued and commit() sends them together: all updates plus a new revision
+    # token in one values_batch_update (sent even when only rows are appended,
+    # so other writers see the change), then appended rows in one append_rows
+    # call per worksheet (values.append with INSERT_ROWS, which picks the row
+    # server-side and grows the sheet). Updates go first because they address
+    # rows by position in the snapshot, which an insert could shift.
+
+    def __init__(self, sheet: Optional[SheetHandles] = None, expect_revision: Optional[str] = None):
+        # With expect_revision set, commit() writes nothing (and returns False)
+        # if another writer has committed since that token was read.
+        # revision is the token this txn wrote, once committed; session_id is
+        # set by plans that decide a session's statuses (see _guarded_write).
+        self.sheet = sheet or get_sheet()
+        self.expect_revision = expect_revision
+        self.revision: Optional[str] = None
+        self.session_id: Optional[str] = None
+        self.updates: List[dict] = []
+        self.appends: Dict[str, Tuple[gspread.Worksheet, List[list]]] = {}
+
+    def update(self, range_name: str, values: List[list]):
+        self.updates.append({"range": range_name, "values": values})
+
+    def update_cell(self, ws: gspread.Worksheet, row: int, col: int, value):
+        self.update(f"{ws.title}!{rowcol_to_a1(row, col)}", [[value]])
+
+    def append(self, ws: gspread.Worksheet, row: list):
+        self.appends.setdefault(ws.title, (ws, []))[1].append(row)
+
+    def commit(self) -> bool:
+        if not self.updates and not self.appends:
+            return True
+        sh, ws_sessions, _ = self.sheet
+        if self.expect_revision is not None and _current_revision(self.sheet) != self.expect_revision:
+            return False
+        # Each request is retried on its own, so a throttled append doesn't
+        # replay updates; appends only retry on 429. If a request still fails
+        # (APIError), whatever landed before it is kept and the cache dropped
+        try:
+            # The token moves on every commit, appends included
+            self.revision = uuid.uuid4().hex
+            _retry(sh.values_batch_update)({
+                "valueInputOption": "RAW",
+                "data": self.updates + [
+                    {"range": f"{ws_sessions.title}!{REVISION_CELL}", "values": [[self.revision]]},
+                ],
+            })
+            for ws, rows in self.appends.values():
+                _retry(ws.append_rows, QUOTA_STATUS_CODES)(
+                    rows, value_input_option="RAW", insert_data_option="INSERT_ROWS",
+                )
+        finally:
+            self.updates, self.appends = [], {}
+            invalidate_cache()
+        return True
+
+
+def invalidate_cache():
+    _fetch_all.clear()
+    _load_session_list.clear()
+    _load_session_notes.clear()
+    _load_signups_df.clear()
+
+
+def _guarded_write(plan, sheet: Optional[SheetHandles] = None):
+    # Optimistic write shared by the signup writers: plan(txn, snap) queues its
+    # changes on txn from one fresh (uncached) Snapshot and returns the
+    # caller's result. The txn only commits if the token still matches that
+    # snapshot; otherwise the plan is rebuilt from fresh data (at most
+    # WRITE_RETRIES times). The token check is best effort, so after a commit
+    # the token is read back: if another writer has already replaced it and
+    # the plan set txn.session_id, that session's statuses get one reconcile
+    # pass (apply_priority_logic). Returns (committed, result); a Sheets error
+    # that outlasted _retry also counts as not committed, so callers report
+    # it to the user.
+    for _ in range(WRITE_RETRIES):
+        try:
+            snap = Snapshot(_read_snapshot(sheet))
+            txn = SheetTxn(sheet, expect_revision=snap.revision)
+            result = plan(txn, snap)
+            if txn.commit():
+                if txn.session_id and txn.revision and _current_revision(txn.sheet) != txn.revision:
+                    apply_priority_logic(txn.session_id, sheet)
+                return True, result
+        except gspread.exceptions.APIError:
+            return False, None
+    return False, None
+
+
+def write_session(session_date: dt.date, capacity: int, cutoff_utc: dt.datetime, title: str, notes: str,
+                  sheet: Optional[SheetHandles] = None) -> Optional[str]:
+    # Returns the new session id, or None if the sheet write failed
+    txn = SheetTxn(sheet)
     sid = str(uuid.uuid4())
-    ws_sessions.append_row([
+    txn.append(txn.sheet[1], [
         sid,
         session_date.isoformat(),
         str(capacity),
@@ -109,124 +389,174 @@ def write_session(session_date: dt.date, capacity: int, cutoff_utc: dt.datetime,
         title,
         notes,
     ])
+    try:
+        txn.commit()
+    except gspread.exceptions.APIError:
+        return None
     return sid
 
 
 def read_signups(session_id: str) -> List[dict]:
-    _, _, ws_signups = get_sheet()
-    rows = ws_signups.get_all_records()
-    return [r for r in rows if r.get("session_id") == session_id and r.get("status") != "removed"]
+    # Active signups for the session, already in priority order
+    return _active_signups(_load_signups_df(), session_id)
 
 
-def append_signup(session_id: str, name: str, role: str, added_by: Optional[str]) -> Tuple[bool, str]:
+def append_signup(session_id: str, name: str, role: str, added_by: Optional[str],
+                  sheet: Optional[SheetHandles] = None) -> Tuple[bool, str]:
     if not name.strip():
         return False, "Name is required."
     if role not in ("core","outsider"):
         return False, "Invalid role."
 
-    # Check duplicate
-    existing = read_signups(session_id)
-    if any(s["name"].strip().lower() == name.strip().lower() for s in existing):
-        return False, f"{name} is already listed for this session."
-
-    _, _, ws_signups = get_sheet()
-    ws_signups.append_row([
-        str(uuid.uuid4()),
-        session_id,
-        name.strip(),
-        role,
-        (added_by or "").strip(),
-        utc_now_str(),
-        "waitlist",
-    ])
-    # Re-apply priority (writes back confirmed statuses)
-    apply_priority_logic(session_id)
-    return True, f"Added {name} as {role}."
-
-
-def update_signup_status(signup_id: str, new_status: str):
-    _, _, ws_signups = get_sheet()
-    data = ws_signups.get_all_values()
-    headers = data[0]
-    idx_map = {h:i for i,h in enumerate(headers)}
-    for r_i, row in enumerate(data[1:], start=2):  # 1-based with header
-        if row[idx_map["id"]] == signup_id:
-            ws_signups.update_cell(r_i, idx_map["status"]+1, new_status)
+    def plan(txn: SheetTxn, snap: Snapshot) -> Tuple[bool, str]:
+        # Check duplicate
+        existing = snap.signups(session_id)
+        existing_names = {r["name"].strip().lower() for r in existing}
+        if name.strip().lower() in existing_names:
+            return False, f"{name} is already listed for this session."
+
+        s = snap.session(session_id)
+        if not s:
+            return False, "Session not found."
+
+        _, _, ws_signups = txn.sheet
+        headers = snap.signup_headers
+        txn.session_id = session_id
+
+        candidate = {
+            "id": str(uuid.uuid4()),
+            "session_id": session_id,
+            "name": name.strip(),
+            "role": role,
+            "added_by": (added_by or "").strip(),
+            "created_utc": utc_now_str(),
+            "_pri": role_priority(role),
+        }
+        # Decide the final status of everyone (candidate included) before writing
+        ordered = list(existing)
+        insort(ordered, candidate, key=PRIORITY_KEY)
+        to_confirm = priority_confirmed_ids(ordered, int(s["capacity"]))
+        candidate["status"] = "confirmed" if candidate["id"] in to_confirm else "waitlist"
+
+        # The new row is appended (with its final status) and any displaced
+        # statuses go out in one batch update
+        txn.append(ws_signups, [candidate.get(h, "") for h in headers])
+        for r in existing:
+            desired = "confirmed" if r["id"] in to_confirm else "waitlist"
+            if r["status"] != desired:
+                txn.update_cell(ws_signups, r["_row"], snap.status_col, desired)
+        return True, f"Added {name} as {role}."
+
+    committed, result = _guarded_write(plan, sheet)
+    return result if committed else (False, "The list is busy right now, please try again.")
+
+
+def update_signup_status(signup_id: str, new_status: str, sheet: Optional[SheetHandles] = None) -> bool:
+    def plan(txn: SheetTxn, snap: Snapshot):
+        rows = snap.df[snap.df["id"] == signup_id]
+        if rows.empty:
+            return
+        r = rows.iloc[0]
+        _, _, ws_signups = txn.sheet
+        txn.update_cell(ws_signups, int(r["_row"]), snap.status_col, new_status)
+
+        s = snap.session(r["session_id"])
+        if new_status != "removed" or r["status"] != "confirmed" or not s:
             return
+        # A removed confirmed player's spot goes to the next waitlisted player
+        # in the same write. Before the cutoff only core players move up;
+        # outsiders wait for the auto-fill, as they would without the removal.
+        signups = [w for w in snap.signups(s["id"]) if w["id"] != signup_id]
+        confirmed = [w for w in signups if w["status"] == "confirmed"]
+        waiting = [w for w in signups if w["status"] != "confirmed"]
+        if before_cutoff(s):
+            waiting = [w for w in waiting if w["role"] == "core"]
+        if waiting and len(confirmed) < int(s["capacity"]):
+            txn.update_cell(ws_signups, waiting[0]["_row"], snap.status_col, "confirmed")
+        txn.session_id = s["id"]
+
+    committed, _ = _guarded_write(plan, sheet)
+    return committed
 
 
 def get_session_by_id(session_id: str) -> Optional[dict]:
-    sessions = read_sessions()
-    for s in sessions:
-        if s["id"] == session_id:
-            return s
-    return None
+    return _find_session(_load_session_list(), session_id)
 
 
 def list_sessions(limit: int = 50) -> List[Tuple[str,str,int,str,str]]:
-    sessions = read_sessions()
-    out = []
-    for s in sessions[:limit]:
-        out.append((s["id"], s["session_date"], s["capacity"], s["cutoff_utc"], s.get("title","")))
-    return out
+    return [s[:5] for s in _load_session_list()[:limit]]
 
 # Logic
 
-def apply_priority_logic(session_id: str):
-    s = get_session_by_id(session_id)
-    if not s:
-        return
-    capacity = int(s["capacity"]) if s else 0
-    signups = read_signups(session_id)
-    # Order: core first, then outsiders; each by created_utc
-    signups.sort(key=lambda r: (0 if r["role"]=="core" else 1, r["created_utc"]))
-
-    # Determine who is confirmed vs waitlist
-    to_confirm = set()
-    for i, r in enumerate(signups):
-        if i < capacity:
-            to_confirm.add(r["id"])
-
-    # Write back statuses
-    _, _, ws_signups = get_sheet()
-    data = ws_signups.get_all_values()
-    headers = data[0]
-    idx_map = {h:i for i,h in enumerate(headers)}
-    for r_i, row in enumerate(data[1:], start=2):
-        if row[idx_map["session_id"]] == session_id and row[idx_map["status"]] != "removed":
-            sid = row[idx_map["id"]]
-            desired = "confirmed" if sid in to_confirm else "waitlist"
-            if row[idx_map["status"]] != desired:
-                ws_signups.update_cell(r_i, idx_map["status"]+1, desired)
-
-
-def auto_fill_from_waitlist(session_id: str, force: bool = False) -> Tuple[int,int]:
-    s = get_session_by_id(session_id)
-    if not s:
-        return 0, 0
-    capacity = int(s["capacity"])
-    cutoff = dt.datetime.fromisoformat(s["cutoff_utc"]) if s.get("cutoff_utc") else None
-    if not force and cutoff and dt.datetime.utcnow() < cutoff:
-        return 0, 0
-
-    signups = read_signups(session_id)
-    confirmed = [r for r in signups if r["status"] == "confirmed"]
-    remaining = max(0, capacity - len(confirmed))
-    if remaining == 0:
-        return 0, 0
-
-    # Candidates: everyone not confirmed, order outsiders first by created_utc (since cores should already be ahead)
-    candidates = [r for r in signups if r["status"] != "confirmed"]
-    # Order: outsiders first, then any remaining cores (unlikely), by time
-    candidates.sort(key=lambda r: (0 if r["role"]=="outsider" else 1, r["created_utc"]))
-
-    promoted = 0
-    for r in candidates:
-        if promoted >= remaining:
-            break
-        update_signup_status(r["id"], "confirmed")
-        promoted += 1
-    return promoted, max(0, remaining - promoted)
+def role_priority(role: str) -> int:
+    return 0 if role == "core" else 1
+
+
+# Order: core first, then outsiders; each by created_utc
+PRIORITY_KEY = itemgetter("_pri", "created_utc")
+
+
+def before_cutoff(session: dict) -> bool:
+    cutoff = dt.datetime.fromisoformat(session["cutoff_utc"]) if session.get("cutoff_utc") else None
+    return bool(cutoff and dt.datetime.utcnow() < cutoff)
+
+
+def priority_confirmed_ids(ordered: List[dict], capacity: int) -> set:
+    # `ordered` is in priority order (as returned by read_signups):
+    # the first `capacity` players are confirmed, the rest waitlisted
+    return {r["id"] for r in ordered[:capacity]}
+
+
+def apply_priority_logic(session_id: str, sheet: Optional[SheetHandles] = None) -> bool:
+    def plan(txn: SheetTxn, snap: Snapshot):
+        s = snap.session(session_id)
+        if not s:
+            return
+        signups = snap.signups(session_id)
+        to_confirm = priority_confirmed_ids(signups, int(s["capacity"]))
+
+        # Write back statuses (one request for all changes instead of one per cell)
+        _, _, ws_signups = txn.sheet
+        for r in signups:
+            desired = "confirmed" if r["id"] in to_confirm else "waitlist"
+            if r["status"] != desired:
+                txn.update_cell(ws_signups, r["_row"], snap.status_col, desired)
+
+    committed, _ = _guarded_write(plan, sheet)
+    return committed
+
+
+def auto_fill_from_waitlist(session_id: str, force: bool = False,
+                            sheet: Optional[SheetHandles] = None) -> Optional[Tuple[int,int]]:
+    # (promoted, remaining), or None if the write didn't go through
+    def plan(txn: SheetTxn, snap: Snapshot) -> Tuple[int,int]:
+        s = snap.session(session_id)
+        if not s:
+            return 0, 0
+        capacity = int(s["capacity"])
+        if not force and before_cutoff(s):
+            return 0, 0
+
+        signups = snap.signups(session_id)
+        confirmed = [r for r in signups if r["status"] == "confirmed"]
+        remaining = max(0, capacity - len(confirmed))
+        if remaining == 0:
+            return 0, 0
+
+        # Candidates: everyone not confirmed, order outsiders first by created_utc (since cores should already be ahead)
+        candidates = [r for r in signups if r["status"] != "confirmed"]
+        # Order: outsiders first, then any remaining cores (unlikely), by time
+        candidates.sort(key=lambda r: (1 - r["_pri"], r["created_utc"]))
+
+        to_promote = candidates[:remaining]
+        _, _, ws_signups = txn.sheet
+        txn.session_id = session_id
+        for r in to_promote:
+            txn.update_cell(ws_signups, r["_row"], snap.status_col, "confirmed")
+        return len(to_promote), max(0, remaining - len(to_promote))
+
+    committed, result = _guarded_write(plan, sheet)
+    return result if committed else None
 
 # ---------------------- UI ----------------------
 st.set_page_config(page_title="Badminton Signup", page_icon="🏸", layout="wide")
@@ -235,8 +565,43 @@ st.title("🏸 Badminton Signup & Waitlist (Google Sheets)")
 
 view_tab, signup_tab, admin_tab = st.tabs(["📋 Current Session", "✍️ Sign Up", "🔐 Admin"]) 
 
+def _signup_table(rows: List[dict]):
+    # One table element for the whole list instead of a st.write per player
+    st.dataframe(
+        [
+            {
+                "#": i + 1,
+                "Name": r["name"],
+                "Role": r["role"],
+                "Added by": r.get("added_by", "") if r["role"] == "outsider" else "",
+            }
+            for i, r in enumerate(rows)
+        ],
+        hide_index=True,
+        width="stretch",
+    )
+
+def _rerun_app(flash_key: str, kind: str, msg: str):
+    # A successful write changes what every tab shows, so rerun the whole app
+    # (not just the current fragment); the message is shown once on that run
+    st.session_state[flash_key] = (kind, msg)
+    st.rerun(scope="app")
+
+
+def _show_flash(flash_key: str):
+    flash = st.session_state.pop(flash_key, None)
+    if flash:
+        kind, msg = flash
+        getattr(st, kind)(msg)
+
+# Each tab body is a fragment: widget changes rerun only that tab, not the
+# whole script, so the other tabs don't re-read the sheet. Successful writes
+# rerun the whole app via _rerun_app. Sheet handles are fetched once per tab
+# run and passed to the write helpers.
+
 # -------- Current Session Tab --------
-with view_tab:
+@st.fragment
+def _view_fragment():
     sessions = list_sessions(limit=100)
     if not SHEET_ID:
         st.error("Google Sheet ID missing. Set [app].sheet_id in Streamlit secrets.")
@@ -250,8 +615,9 @@ with view_tab:
 
         st.subheader(s.get("title") or f"Session on {s['session_date']}")
         st.caption(f"Date: {s['session_date']} • Capacity: {s['capacity']} • Cutoff (UTC): {s['cutoff_utc']}")
-        if s.get("notes"):
-            st.write(s["notes"]) 
+        notes = _load_session_notes(s["_row"])
+        if notes:
+            st.write(notes)
 
         signups = read_signups(session_id)
         # Build confirmed / waitlist lists
@@ -262,17 +628,13 @@ with view_tab:
         with c1:
             st.markdown("### ✅ Confirmed")
             if confirmed:
-                for i, r in enumerate(sorted(confirmed, key=lambda x: x["created_utc"])):
-                    by = f" (by {r['added_by']})" if r['role']=="outsider" and r.get('added_by') else ""
-                    st.write(f"{i+1}. {r['name']} — {r['role']}{by}")
+                _signup_table(sorted(confirmed, key=itemgetter("created_utc")))
             else:
                 st.write("No one confirmed yet.")
         with c2:
             st.markdown("### ⏳ Waitlist")
             if waitlist:
-                for i, r in enumerate(sorted(waitlist, key=lambda x: (0 if x['role']=='core' else 1, x['created_utc']))):
-                    by = f" (by {r['added_by']})" if r['role']=="outsider" and r.get('added_by') else ""
-                    st.write(f"{i+1}. {r['name']} — {r['role']}{by}")
+                _signup_table(waitlist)
             else:
                 st.write("Empty.")
 
@@ -280,8 +642,14 @@ with view_tab:
         left = max(0, int(s['capacity']) - len(confirmed))
         st.metric("Spots remaining", left)
 
+
+with view_tab:
+    _view_fragment()
+
 # -------- Sign Up Tab --------
-with signup_tab:
+@st.fragment
+def _signup_fragment():
+    sheet = get_sheet()
     sessions = list_sessions(limit=100)
     if not sessions:
         st.info("No sessions available to join yet.")
@@ -298,15 +666,25 @@ with signup_tab:
             added_by = st.text_input("Which core member is adding this outsider? (your name)")
 
         if st.button("Add to list"):
-            ok, msg = append_signup(session_id, name, role, added_by)
-            st.success(msg) if ok else st.error(msg)
+            ok, msg = append_signup(session_id, name, role, added_by, sheet=sheet)
+            if ok:
+                _rerun_app("signup_flash", "success", msg)
+            st.error(msg)
+        _show_flash("signup_flash")
+
+
+with signup_tab:
+    _signup_fragment()
 
 # -------- Admin Tab --------
-with admin_tab:
+@st.fragment
+def _admin_fragment():
     st.markdown("#### Admin Login")
     pin = st.text_input("Enter admin PIN", type="password")
     if pin == ADMIN_PIN:
+        sheet = get_sheet()
         st.success("Admin authenticated.")
+        _show_flash("admin_flash")
         st.markdown("### Create Session")
         today = dt.date.today()
         next_sat = today + dt.timedelta(days=(5 - today.weekday()) % 7)
@@ -321,8 +699,10 @@ with admin_tab:
         notes = st.text_area("Notes (court, fee, etc.)", value="Location: Court ABC\nFee: £5")
 
         if st.button("Create session"):
-            sid = write_session(session_date, int(capacity), cutoff_utc, title, notes)
-            st.success(f"Session created ✔")
+            if write_session(session_date, int(capacity), cutoff_utc, title, notes, sheet=sheet):
+                _rerun_app("admin_flash", "success", "Session created ✔")
+            else:
+                st.error("Couldn't save the session to the sheet, please try again.")
 
         st.divider()
         st.markdown("### Manage Sessions")
@@ -341,25 +721,36 @@ with admin_tab:
             c1, c2 = st.columns(2)
             with c1:
                 if st.button("Run auto-fill now (respect cutoff)"):
-                    promoted, remaining = auto_fill_from_waitlist(session_id, force=False)
-                    if promoted:
-                        st.success(f"Promoted {promoted} from waitlist. Remaining: {remaining}")
+                    result = auto_fill_from_waitlist(session_id, force=False, sheet=sheet)
+                    if result is None:
+                        st.error("The list is busy right now, please try again.")
+                    elif result[0]:
+                        _rerun_app("admin_flash", "success", f"Promoted {result[0]} from waitlist. Remaining: {result[1]}")
                     else:
                         st.info("No promotions (before cutoff or no spots).")
             with c2:
                 if st.button("Force auto-fill (ignore cutoff)"):
-                    promoted, remaining = auto_fill_from_waitlist(session_id, force=True)
-                    st.warning(f"Forced promotion: {promoted} moved up. Remaining: {remaining}")
+                    result = auto_fill_from_waitlist(session_id, force=True, sheet=sheet)
+                    if result is None:
+                        st.error("The list is busy right now, please try again.")
+                    else:
+                        msg = f"Forced promotion: {result[0]} moved up. Remaining: {result[1]}"
+                        if result[0]:
+                            _rerun_app("admin_flash", "warning", msg)
+                        st.warning(msg)
 
             # Remove a signup
             st.markdown("#### Remove a signup")
-            all_active = sorted(signups, key=lambda r: (0 if r['status']=="confirmed" else 1, 0 if r['role']=="core" else 1, r['created_utc']))
+            # Confirmed first; the stable sort keeps priority order within each group
+            all_active = sorted(signups, key=lambda r: r['status'] != "confirmed")
             if all_active:
                 names = {f"{r['name']} ({r['role']}, {r['status']})": r['id'] for r in all_active}
                 to_remove = st.selectbox("Pick a player to remove", list(names.keys()))
                 if st.button("Remove player"):
-                    update_signup_status(names[to_remove], "removed")
-                    st.success("Removed.")
+                    if update_signup_status(names[to_remove], "removed", sheet=sheet):
+                        _rerun_app("admin_flash", "success", "Removed.")
+                    else:
+                        st.error("The list is busy right now, please try again.")
             else:
                 st.info("No signups yet.")
         else:
@@ -367,4 +758,8 @@ with admin_tab:
     elif pin:
         st.error("Wrong PIN.")
 
+
+with admin_tab:
+    _admin_fragment()
+
 st.caption("Tip: Share this app link in WhatsApp. Core members can add outsiders under Sign Up. On/after cutoff, run Auto-fill in Admin.")